@@ -1,6 +1,8 @@
 import excel_import
 import json_serializer as json_s
+import sqlite_export
 import turtle
+import vocabulary_diff
 
 import pandas as pd
 from childsafe import ChildSafe
@@ -10,19 +12,28 @@ def main():
     de_turtle = False
     para_turtle = True
     para_json = True
+    para_sqlite = False
+    diferenca = False
+
+    # A comparação precisa ocorrer antes da exportação, que sobrescreve o Turtle da versão anterior
+    if diferenca:
+        vocabulary_diff.save_diff('../Ontologia/child-safe.ttl', '../../Child-safe.xlsx',
+                                  '../Ontologia/child-safe-diff.jsonl')
 
     child_safe = None
     if de_turtle:
         terms = turtle.read_from('../Ontologia/child-safe.ttl')
         child_safe = ChildSafe(terms)
 
-    if para_turtle or para_json:
+    if para_turtle or para_json or para_sqlite:
         if child_safe is None:
             child_safe = excel_import.vocabulary_from_excel('../../Child-safe.xlsx')
         if para_turtle:
             turtle.save_as(child_safe, '../Ontologia/child-safe.ttl')
         if para_json:
             json_s.export_to_json(child_safe, '../Navegador/js/child-safe.js')
+        if para_sqlite:
+            sqlite_export.export_to_sqlite(child_safe, '../Ontologia/child-safe.db')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+import tempfile
+from childsafe import ChildSafe
+
+
+# Superclasses que são termos do vocabulário são referenciadas por superclasse_id; as classes marcadoras derivadas
+# dos relacionamentos (_Causa, _Efeito etc.) não são termos e por isso são gravadas apenas pelo nome em
+# classe_marcadora.
+# Não há tabela de nomes de classes porque TermDescriptor.append_class_name os grava junto com as superclasses.
+_schema = """
+    CREATE TABLE termos (
+        id INTEGER PRIMARY KEY,
+        nome TEXT NOT NULL,
+        descritor TEXT NOT NULL,
+        definicao TEXT,
+        recomendado INTEGER NOT NULL
+    );
+    CREATE TABLE equivalentes (
+        termo_id INTEGER NOT NULL REFERENCES termos (id),
+        equivalente_id INTEGER NOT NULL REFERENCES termos (id)
+    );
+    CREATE TABLE superclasses (
+        termo_id INTEGER NOT NULL REFERENCES termos (id),
+        superclasse_id INTEGER REFERENCES termos (id),
+        classe_marcadora TEXT
+    );
+    CREATE TABLE eixos (termo_id INTEGER NOT NULL REFERENCES termos (id), eixo TEXT NOT NULL);
+    CREATE TABLE relacionamentos (
+        termo_id INTEGER NOT NULL REFERENCES termos (id),
+        relacionamento TEXT NOT NULL,
+        objeto_id INTEGER NOT NULL REFERENCES termos (id)
+    );
+    CREATE TABLE fontes (termo_id INTEGER NOT NULL REFERENCES termos (id), fonte TEXT NOT NULL);
+    CREATE TABLE links (termo_id INTEGER NOT NULL REFERENCES termos (id), link TEXT NOT NULL);
+    CREATE VIRTUAL TABLE termos_fts USING fts5(descritor, definicao, content='termos', content_rowid='id');
+"""
+
+_indexes = [
+    'CREATE UNIQUE INDEX termos_nome ON termos (nome)',
+    'CREATE INDEX equivalentes_termo ON equivalentes (termo_id)',
+    'CREATE INDEX superclasses_termo ON superclasses (termo_id)',
+    'CREATE INDEX superclasses_superclasse ON superclasses (superclasse_id)',
+    'CREATE INDEX eixos_termo ON eixos (termo_id)',
+    'CREATE INDEX relacionamentos_termo ON relacionamentos (termo_id)',
+    'CREATE INDEX relacionamentos_objeto ON relacionamentos (objeto_id)',
+    'CREATE INDEX fontes_termo ON fontes (termo_id)',
+    'CREATE INDEX links_termo ON links (termo_id)',
+]
+
+
+def export_to_sqlite(child_safe: ChildSafe, file_name: str):
+    """
+    Writes a Child-Safe vocabulary into a normalized SQLite database, with an FTS5 full-text index over the term
+    labels and definitions. The database is built in a temporary file that replaces an existing one only when the
+    export succeeds.
+
+    :param child_safe: the vocabulary to be exported.
+    :param file_name: the SQLite database file name.
+    """
+
+    items = [item for item in child_safe.items if item.name[0] != '*']
+    ids = {item.name: index for index, item in enumerate(items, start=1)}
+
+    file_descriptor, temporary_name = tempfile.mkstemp(suffix='.db', dir=os.path.dirname(os.path.abspath(file_name)))
+    os.close(file_descriptor)
+    try:
+        connection = sqlite3.connect(temporary_name)
+        try:
+            connection.executescript(_schema)
+
+            # Os dados são incluídos em uma única transação e os índices criados somente após a carga
+            with connection:
+                connection.executemany('INSERT INTO termos VALUES (?, ?, ?, ?, ?)', [
+                    (ids[item.name], item.name, item.label if item.label is not None else item.name, item.comment,
+                     int(item.recommended)) for item in items])
+                connection.executemany('INSERT INTO equivalentes VALUES (?, ?)', [
+                    (ids[item.name], ids[equivalent.name]) for item in items
+                    for equivalent in item.equivalents if equivalent.name in ids])
+                connection.executemany('INSERT INTO superclasses VALUES (?, ?, ?)', [
+                    (ids[item.name], ids.get(superclass), None if superclass in ids else superclass)
+                    for item in items for superclass in item.superclasses])
+                connection.executemany('INSERT INTO eixos VALUES (?, ?)', [
+                    (ids[item.name], domain) for item in items for domain in item.domains])
+                connection.executemany('INSERT INTO relacionamentos VALUES (?, ?, ?)', [
+                    (ids[item.name], rel, ids[obj]) for item in items for rel, obj in item.relationships
+                    if obj in ids])
+                connection.executemany('INSERT INTO fontes VALUES (?, ?)', [
+                    (ids[item.name], source) for item in items for source in item.sources])
+                connection.executemany('INSERT INTO links VALUES (?, ?)', [
+                    (ids[item.name], link.strip()) for item in items for link in item.links])
+                for statement in _indexes:
+                    connection.execute(statement)
+                connection.execute("INSERT INTO termos_fts (termos_fts) VALUES ('rebuild')")
+        finally:
+            connection.close()
+        # mkstemp cria o arquivo acessível apenas ao dono; o banco deve ter as permissões das demais exportações
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temporary_name, 0o666 & ~umask)
+        os.replace(temporary_name, file_name)
+    except BaseException:
+        os.remove(temporary_name)
+        raise
+    print(f'\nGravado o arquivo {file_name}')
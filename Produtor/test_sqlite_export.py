@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import sqlite_export
+from childsafe import ChildSafe
+
+
+def vocabulary_item(termo, **values):
+    item = {
+        'termo': termo,
+        'definicao': 'Conduta que viola a dignidade sexual da criança',
+        'recomendado': True,
+        'fontes': ['Lei 8.069/1990'],
+        'links': ['http://www.planalto.gov.br'],
+        'eixos': ['CA'],
+        'equivalentes': [],
+        'termos_gerais': [],
+        'classes': [],
+        'relacionamentos': [],
+        'termos_relacionados': [],
+    }
+    item.update(values)
+    return item
+
+
+def sample_vocabulary():
+    return ChildSafe([
+        vocabulary_item('Abuso sexual', equivalentes=['Violência sexual', '*Estupro']),
+        vocabulary_item('Crime', definicao='Ato punível pela lei penal', termos_gerais=['Abuso sexual'],
+                        relacionamentos=['causa'], termos_relacionados=['Abuso sexual']),
+    ])
+
+
+class SqliteExportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'child-safe.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def query(self, sql, *parameters):
+        connection = sqlite3.connect(self.file_name)
+        try:
+            return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+    def test_export(self):
+        sqlite_export.export_to_sqlite(sample_vocabulary(), self.file_name)
+
+        counts = {table: self.query(f'SELECT COUNT(*) FROM {table}')[0][0]
+                  for table in ['termos', 'equivalentes', 'superclasses', 'eixos', 'relacionamentos', 'fontes',
+                                'links']}
+        self.assertEqual({'termos': 3, 'equivalentes': 2, 'superclasses': 3, 'eixos': 2, 'relacionamentos': 2,
+                          'fontes': 2, 'links': 2}, counts)
+        self.assertEqual([], self.query("SELECT id FROM termos WHERE nome LIKE '*%'"))
+
+        superclasses = self.query('SELECT t.nome, s.nome, classe_marcadora FROM superclasses '
+                                  'JOIN termos t ON t.id = termo_id LEFT JOIN termos s ON s.id = superclasse_id '
+                                  'ORDER BY t.nome, s.nome, classe_marcadora')
+        self.assertEqual([('Abuso_Sexual', None, '_Efeito'), ('Crime', None, '_Causa'),
+                          ('Crime', 'Abuso_Sexual', None)], superclasses)
+
+        crime_id = self.query("SELECT id FROM termos WHERE nome = 'Crime'")[0][0]
+        self.assertEqual([(crime_id,)], self.query('SELECT rowid FROM termos_fts WHERE termos_fts MATCH ?', 'penal'))
+
+    def test_file_mode_follows_umask(self):
+        sqlite_export.export_to_sqlite(sample_vocabulary(), self.file_name)
+
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(0o666 & ~umask, os.stat(self.file_name).st_mode & 0o777)
+
+    def test_failed_export_keeps_previous_database(self):
+        sqlite_export.export_to_sqlite(sample_vocabulary(), self.file_name)
+        child_safe = sample_vocabulary()
+        child_safe.ids_terms['Crime'].sources.append(object())
+
+        with self.assertRaises(sqlite3.Error):
+            sqlite_export.export_to_sqlite(child_safe, self.file_name)
+
+        self.assertEqual([(3,)], self.query('SELECT COUNT(*) FROM termos'))
+        self.assertEqual(['child-safe.db'], os.listdir(self.directory.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
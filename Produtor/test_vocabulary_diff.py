@@ -0,0 +1,78 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import turtle
+import vocabulary_diff
+from childsafe import ChildSafe
+
+
+def vocabulary_item(termo, **values):
+    item = {
+        'termo': termo,
+        'definicao': 'Violência "grave"\ncontra criança',
+        'recomendado': True,
+        'fontes': ['Lei "8.069"\n1990'],
+        'links': [' http://www.planalto.gov.br '],
+        'eixos': ['CA', 'DI'],
+        'equivalentes': [],
+        'termos_gerais': [],
+        'classes': [],
+        'relacionamentos': [],
+        'termos_relacionados': [],
+    }
+    item.update(values)
+    return item
+
+
+def sample_vocabulary():
+    return [
+        vocabulary_item('Abuso sexual', definicao='Ver C:\\Documentos\\b',
+                        equivalentes=['Violência sexual', '*Estupro']),
+        vocabulary_item('Crime', recomendado=False, termos_gerais=['Abuso sexual'],
+                        equivalentes=['Lei 8.069/90', 'Sigla_ECA'], fontes=['Código Penal\\Art. 217'],
+                        relacionamentos=['causa', 'aplicado em'], termos_relacionados=['Abuso sexual', 'Vítima']),
+        vocabulary_item('Vítima', definicao=None, classes=['Abuso sexual']),
+    ]
+
+
+class VocabularyDiffTest(unittest.TestCase):
+    def test_turtle_round_trip_has_no_changes(self):
+        child_safe = ChildSafe(sample_vocabulary())
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'child-safe.ttl')
+            turtle.save_as(child_safe, file_name)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                previous_build = vocabulary_diff.load_vocabulary(file_name)
+
+        self.assertEqual('', output.getvalue())
+        self.assertEqual([], list(vocabulary_diff.diff_vocabularies(previous_build, child_safe)))
+
+    def test_changes(self):
+        vocabulary = sample_vocabulary()
+        old = ChildSafe(vocabulary)
+        vocabulary[1] = dict(vocabulary[1], termo='Delito')
+        vocabulary[2]['links'] = ['http://www.gov.br']
+        vocabulary.append(vocabulary_item('Aliciamento'))
+        new = ChildSafe(vocabulary)
+
+        changes = {change.name: change for change in vocabulary_diff.diff_vocabularies(old, new)}
+
+        self.assertEqual(['Abuso_Sexual', 'Aliciamento', 'Delito', 'Lei_8069_90', 'Sigla_Eca', 'Vítima'],
+                         sorted(changes))
+        self.assertEqual('added', changes['Aliciamento'].status)
+        self.assertEqual('renamed', changes['Delito'].status)
+        self.assertEqual(vocabulary_diff.FieldChange(['Delito'], ['Crime']), changes['Delito'].fields['name'])
+        self.assertEqual('changed', changes['Abuso_Sexual'].status)
+        self.assertEqual(vocabulary_diff.FieldChange(['causadoPor Delito'], ['causadoPor Crime']),
+                         changes['Abuso_Sexual'].fields['relationships'])
+        self.assertEqual(vocabulary_diff.FieldChange(['http://www.gov.br'], ['http://www.planalto.gov.br']),
+                         changes['Vítima'].fields['links'])
+        self.assertEqual(vocabulary_diff.FieldChange(['Delito'], ['Crime']),
+                         changes['Lei_8069_90'].fields['equivalents'])
+
+
+if __name__ == '__main__':
+    unittest.main()
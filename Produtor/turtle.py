@@ -1,4 +1,5 @@
-from childsafe import ChildSafe, TermDescriptor
+import os
+from childsafe import ChildSafe, TermDescriptor, relationship_descriptors
 from rdflib import Graph
 
 
@@ -29,6 +30,12 @@ def read_terms(graph: Graph) -> list[dict]:
         'Saúde': 'SA',
         'Tecnologia': 'TE',
     }
+    # Os relacionamentos são gravados pelo nome da propriedade (ex.: causadoPor) e precisam ser convertidos de volta
+    # para os nomes usados na planilha (ex.: causado por)
+    relationship_names = dict()
+    for relationship, relationship_descriptor in relationship_descriptors.items():
+        relationship_names.setdefault(relationship_descriptor.name, relationship)
+
     subjects = dict()
     for subj, pred, obj in graph:
         namespace, name = parts_of(subj)
@@ -37,6 +44,8 @@ def read_terms(graph: Graph) -> list[dict]:
         if name not in subjects:
             subjects[name] = {
                 'termo': name,
+                'definicao': None,
+                'recomendado': True,
                 'termos_gerais': [],
                 'equivalentes': [],
                 'eixos': [],
@@ -55,10 +64,14 @@ def read_terms(graph: Graph) -> list[dict]:
             term['equivalentes'].append(object_name)
         elif predicate_name == 'subClassOf':
             namespace, object_name = parts_of(obj)
-            term['termos_gerais'].append(object_name)
+            # As classes marcadoras (_Causa, _Efeito etc.) são derivadas novamente a partir dos relacionamentos
+            if object_name[0] != '_':
+                term['termos_gerais'].append(object_name)
         elif predicate_name == 'type':
             namespace, object_name = parts_of(obj)
-            if object_name not in ['Class', 'ObjectProperty', 'AnnotationProperty', 'TransitiveProperty']:
+            # O próprio termo aparece como tipo do indivíduo homônimo e não deve ser tratado como nome de classe
+            if object_name not in ['Class', 'namedIndividual', 'ObjectProperty', 'AnnotationProperty',
+                                   'TransitiveProperty', name]:
                 term['classes'].append(object_name)
         elif predicate_name == 'label':
             term['termo'] = obj
@@ -75,16 +88,21 @@ def read_terms(graph: Graph) -> list[dict]:
         else:
             if namespace == childsafe_uri_base:
                 namespace, object_name = parts_of(obj)
-                term['relacionamentos'].append(predicate_name)
+                term['relacionamentos'].append(relationship_names.get(predicate_name, predicate_name))
                 term['termos_relacionados'].append(object_name)
 
+    # Termos que só aparecem como equivalentes não são devolvidos, mas seus rótulos precisam ser preservados, pois
+    # nem sempre podem ser reconstruídos a partir dos identificadores (ex.: Lei_8069_90)
+    labels = {name: term['termo'] for name, term in subjects.items()}
     subjects = [term for term in list(subjects.values()) if len(term['eixos']) > 0]
+    for term in subjects:
+        term['equivalentes'] = [labels.get(name, name) for name in term['equivalentes']]
     subjects.sort(key=lambda item: item['termo'])
     return subjects
 
 
 def ttl_heading():
-    with open('heading.ttl', 'r', encoding='UTF-8') as f:
+    with open(os.path.join(os.path.dirname(__file__), 'heading.ttl'), 'r', encoding='UTF-8') as f:
         content = f.read()
     content = content\
         .replace('{childsafe_uri}', childsafe_uri)\
@@ -106,6 +124,18 @@ def as_turtle(childsafe: ChildSafe) -> str:
     return '\n'.join(content)
 
 
+def as_turtle_comment(comment: str) -> str:
+    return comment.replace('"', "'")
+
+
+def as_turtle_source(source: str) -> str:
+    return source.replace('\n', '').replace('"', "'")
+
+
+def _escaped(value: str) -> str:
+    return value.replace('\\', '\\\\')
+
+
 def save_as(childsafe: ChildSafe, file_name: str):
     content = as_turtle(childsafe)
     with open(file_name, "w", encoding='UTF-8') as ttl_file:
@@ -134,12 +164,12 @@ def _append_class(content, childsafe_item: TermDescriptor):
     else:
         chunk.append(indent + f':isRecommendedTerm "Não"@pt-BR')
     for source in childsafe_item.sources:
-        value = source.replace('\n', '').replace('"', "'")
+        value = _escaped(as_turtle_source(source))
         chunk.append(indent+f':sourceIs "{value}"@pt-BR')
     for link in childsafe_item.links:
         chunk.append(indent + f':linkIs "{link.strip()}"')
     if childsafe_item.comment is not None:
-        value = childsafe_item.comment.replace('"', "'")
+        value = _escaped(as_turtle_comment(childsafe_item.comment))
         chunk.append(indent+f'rdfs:comment """{value}"""@pt-BR')
     for equivalent in childsafe_item.equivalents:
         if equivalent.name[0] == '*':
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+from collections import Counter, namedtuple
+from typing import Iterator, TextIO
+
+import excel_import
+import turtle
+from childsafe import ChildSafe
+
+
+TermChange = namedtuple('TermChange', ['status', 'name', 'fields'])
+
+FieldChange = namedtuple('FieldChange', ['added', 'removed'])
+
+_scalar_fields = ['label', 'comment', 'recommended']
+_set_fields = ['superclasses', 'class_names', 'equivalents', 'domains', 'sources', 'links', 'relationships']
+
+_fields = _scalar_fields + _set_fields
+
+_empty_term = (None,) * len(_scalar_fields) + ((),) * len(_set_fields)
+
+
+def load_vocabulary(source: str) -> ChildSafe:
+    """
+    Loads a Child-Safe vocabulary from an Excel spreadsheet or from a Turtle file (such as a previous build of
+    child-safe.ttl), choosing the reader by the file extension.
+
+    :param source: the Excel or Turtle file name.
+    :return: the vocabulary as a ChildSafe instance.
+    """
+
+    extension = os.path.splitext(source)[1].lower()
+    if extension in ['.xlsx', '.xls']:
+        return excel_import.vocabulary_from_excel(source)
+    if extension in ['.ttl', '.turtle']:
+        return ChildSafe(turtle.read_from(source))
+    raise ValueError(f'Formato de vocabulário NÃO suportado: "{source}"')
+
+
+def _values(values) -> tuple:
+    # Tuplas de strings deixam de ser acompanhadas pelo coletor de lixo, o que conjuntos não permitem
+    if len(values) < 2:
+        return tuple(values)
+    return tuple(sorted(set(values)))
+
+
+def canonical_terms(child_safe: ChildSafe) -> dict:
+    """
+    Reduces the terms of a vocabulary to what survives a round trip through turtle.save_as and turtle.read_from, so
+    that a vocabulary loaded from Excel and one loaded from its own Turtle build compare as equal.
+
+    :param child_safe: the vocabulary.
+    :return: a dict mapping each term name to a tuple with the values of its fields, in the order of _fields.
+    """
+
+    # Termos iniciados por * não são gravados no Turtle
+    return {term.name: (
+        term.label if term.label is not None else term.name,
+        turtle.as_turtle_comment(term.comment) if term.comment is not None else None,
+        term.recommended,
+        _values(term.superclasses),
+        _values(term.class_names),
+        _values([equivalent.name for equivalent in term.equivalents if equivalent.name[0] != '*']),
+        _values(term.domains),
+        _values([turtle.as_turtle_source(source) for source in term.sources]),
+        _values([link.strip() for link in term.links]),
+        _values([f'{rel} {obj}' for rel, obj in term.relationships]),
+    ) for term in child_safe.items if term.name[0] != '*'}
+
+
+def _content_hash(term: tuple) -> str:
+    # O rótulo fica de fora para que um termo renomeado mantenha o mesmo hash
+    encoded = json.dumps(term[1:], ensure_ascii=False, separators=(',', ':')).encode('UTF-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _unique_hashes(terms: dict, names) -> dict:
+    hashes = {name: _content_hash(terms[name]) for name in names}
+    counts = Counter(hashes.values())
+    return {term_hash: name for name, term_hash in hashes.items() if counts[term_hash] == 1}
+
+
+def _changed_fields(old_term: tuple, new_term: tuple) -> dict:
+    fields = dict()
+    for field, old_value, new_value in zip(_fields, old_term, new_term):
+        if old_value == new_value:
+            continue
+        if field in _scalar_fields:
+            fields[field] = FieldChange([] if new_value is None else [new_value],
+                                        [] if old_value is None else [old_value])
+        else:
+            fields[field] = FieldChange(sorted(set(new_value) - set(old_value)),
+                                        sorted(set(old_value) - set(new_value)))
+    return fields
+
+
+def diff_vocabularies(old: ChildSafe, new: ChildSafe) -> Iterator[TermChange]:
+    """
+    Compares two versions of a Child-Safe vocabulary, yielding the added, removed, renamed and changed terms in name
+    order. A removed and an added term are reported as a rename when they are the only ones sharing the same content
+    hash.
+
+    :param old: the previous version of the vocabulary.
+    :param new: the current version of the vocabulary.
+    :return: an iterator of TermChange instances.
+    """
+
+    old_terms = canonical_terms(old)
+    new_terms = canonical_terms(new)
+    removed_names = old_terms.keys() - new_terms.keys()
+    added_names = new_terms.keys() - old_terms.keys()
+
+    removed_hashes = _unique_hashes(old_terms, removed_names)
+    added_hashes = _unique_hashes(new_terms, added_names)
+    renames = {added_hashes[term_hash]: removed_hashes[term_hash]
+               for term_hash in removed_hashes.keys() & added_hashes.keys()}
+    renamed_names = set(renames.values())
+
+    for name in sorted(old_terms.keys() | new_terms.keys(), key=str.lower):
+        if name in renames:
+            fields = _changed_fields(old_terms[renames[name]], new_terms[name])
+            fields['name'] = FieldChange([name], [renames[name]])
+            yield TermChange('renamed', name, fields)
+        elif name in added_names:
+            yield TermChange('added', name, _changed_fields(_empty_term, new_terms[name]))
+        elif name in removed_names:
+            if name not in renamed_names:
+                yield TermChange('removed', name, _changed_fields(old_terms[name], _empty_term))
+        elif old_terms[name] != new_terms[name]:
+            yield TermChange('changed', name, _changed_fields(old_terms[name], new_terms[name]))
+
+
+def write_diff(changes: Iterator[TermChange], output: TextIO):
+    """
+    Writes the changes as JSON Lines, one term per line, as they are produced.
+
+    :param changes: the changes produced by diff_vocabularies.
+    :param output: the text stream receiving the changes.
+    """
+
+    for change in changes:
+        fields = {field: field_change._asdict() for field, field_change in change.fields.items()}
+        line = {'status': change.status, 'termo': change.name, 'campos': fields}
+        output.write(json.dumps(line, ensure_ascii=False) + '\n')
+
+
+def save_diff(old_source: str, new_source: str, file_name: str):
+    """
+    Compares two versions of a Child-Safe vocabulary, each one an Excel or Turtle file, and writes the changes as
+    JSON Lines.
+
+    :param old_source: the file containing the previous version of the vocabulary.
+    :param new_source: the file containing the current version of the vocabulary.
+    :param file_name: the JSON Lines file name.
+    """
+
+    old = load_vocabulary(old_source)
+    new = load_vocabulary(new_source)
+    with open(file_name, 'w', encoding='UTF-8') as diff_file:
+        write_diff(diff_vocabularies(old, new), diff_file)
+    print(f'\nGravado o arquivo {file_name}')